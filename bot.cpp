@@ -4,10 +4,9 @@ int main() {
   Bot bot;
 
   std::string input;
-  while (true) {
-    // Read a line of input
-    std::getline(std::cin, input);
-
+  // Stop on EOF as well as "quit" so the engine exits cleanly when the
+  // GUI side closes the channel without sending the sentinel
+  while (std::getline(std::cin, input)) {
     // Exit condition
     if (input == "quit") {
       break;
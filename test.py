@@ -1,71 +1,282 @@
+import collections
+import os
+import selectors
+import socket
 import subprocess
 import threading
+import time
 import chess
 import chess.svg
-from PyQt5.QtSvg import QSvgWidget
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLineEdit, QPushButton, QMessageBox
-from PyQt5.QtCore import Qt, pyqtSignal, QObject, QThread
+from PyQt5.QtGui import QBrush, QColor, QPen
+from PyQt5.QtSvg import QGraphicsSvgItem, QSvgRenderer
+from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit,
+                             QPushButton, QMessageBox, QGraphicsScene, QGraphicsView)
+from PyQt5.QtCore import Qt, QByteArray, QTimer, pyqtSignal, pyqtSlot, QObject, QThread
 
 
 class ChessBot:
+    _QUIT = b"quit\n"
+
     def __init__(self, bot_path):
         """
         Initialize the ChessBot class with the path to the C++ executable.
         """
-        self.process = subprocess.Popen(
-            bot_path,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            text=True
-        )
-
-    def send_fen(self, fen):
+        self._read_buffer = bytearray()
+        # The protocol is strict request/response over one channel, so all
+        # exchanges are serialized through this lock; calling send_fen from
+        # several threads at once would interleave responses
+        self._lock = threading.Lock()
+        if os.name == "posix":
+            # A socketpair with large buffers replaces the anonymous pipe:
+            # the child's end becomes the engine's stdin/stdout, so the
+            # engine code is unchanged
+            parent, child = socket.socketpair()
+            parent.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+            parent.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            self.process = subprocess.Popen(
+                bot_path,
+                stdin=child,
+                stdout=child
+            )
+            child.close()
+            self._sock = parent
+            self._stdin = parent.makefile("wb", buffering=65536)
+            self._stdout = None
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(parent, selectors.EVENT_READ)
+        else:
+            # Windows: sockets cannot serve as std handles and select()
+            # does not work on pipes, so keep buffered pipes with
+            # blocking reads
+            self.process = subprocess.Popen(
+                bot_path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                bufsize=65536
+            )
+            self._sock = None
+            self._stdin = self.process.stdin
+            self._stdout = self.process.stdout
+            self._selector = None
+        self._tune_process()
+
+    def _tune_process(self):
+        """
+        Pin the engine off CPU 0 and raise its priority, best effort.
+
+        The engine does all the compute while the GUI mostly idles, so
+        keeping it away from the core handling the GUI/interrupts and
+        bumping its priority reduces scheduling jitter in search time.
+        """
+        try:
+            if hasattr(os, "sched_setaffinity"):
+                cpus = os.sched_getaffinity(0)
+                if len(cpus) > 1:
+                    cpus.discard(0)
+                    os.sched_setaffinity(self.process.pid, cpus)
+            if os.name == "posix":
+                os.setpriority(os.PRIO_PROCESS, self.process.pid, -5)
+            elif os.name == "nt":
+                import ctypes
+                ABOVE_NORMAL_PRIORITY_CLASS = 0x00008000
+                PROCESS_SET_INFORMATION = 0x0200
+                handle = ctypes.windll.kernel32.OpenProcess(
+                    PROCESS_SET_INFORMATION, False, self.process.pid)
+                if handle:
+                    ctypes.windll.kernel32.SetPriorityClass(
+                        handle, ABOVE_NORMAL_PRIORITY_CLASS)
+                    ctypes.windll.kernel32.CloseHandle(handle)
+        except OSError:
+            # Affinity/priority are nice-to-have; lack of privileges or an
+            # exotic platform must not stop the game
+            pass
+
+    def _read_line(self, timeout):
+        """
+        Read one newline-terminated response line, raising TimeoutError if
+        the bot does not answer in time.
+        """
+        if self._selector is None:
+            return self._stdout.readline().decode("ascii").strip()
+
+        deadline = time.monotonic() + timeout
+        while True:
+            newline = self._read_buffer.find(b"\n")
+            if newline != -1:
+                line = self._read_buffer[:newline]
+                del self._read_buffer[:newline + 1]
+                return line.decode("ascii").strip()
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._selector.select(remaining):
+                raise TimeoutError(
+                    f"Bot did not respond within {timeout:.1f} seconds")
+
+            chunk = os.read(self._sock.fileno(), 4096)
+            if not chunk:
+                raise RuntimeError("Bot process closed its output pipe")
+            self._read_buffer += chunk
+
+    def send_fen(self, fen, timeout=10.0):
         """
         Send a FEN string to the bot and receive the best move.
         """
         if self.process.poll() is not None:
             raise RuntimeError("Bot process has terminated unexpectedly")
 
-        # Send the FEN string followed by a newline
-        self.process.stdin.write(fen + "\n")
-        self.process.stdin.flush()
+        with self._lock:
+            # Send the FEN string followed by a newline
+            self._stdin.write((fen + "\n").encode("ascii"))
+            self._stdin.flush()
 
-        # Read and return the bot's response
-        return self.process.stdout.readline().strip()
+            # Read and return the bot's response
+            return self._read_line(timeout)
+
+    def send_fens(self, fens, timeout=10.0):
+        """
+        Send a batch of FEN strings to the bot and receive the best move
+        for each one.
+
+        The bot answers one line per FEN, so all positions are written in
+        a single buffer with one flush instead of one round-trip per FEN.
+        The engine serves the whole batch from its standing read loop
+        without re-initializing between positions.
+        """
+        if self.process.poll() is not None:
+            raise RuntimeError("Bot process has terminated unexpectedly")
+
+        with self._lock:
+            # Write all FENs at once and flush a single time
+            self._stdin.write("".join(fen + "\n" for fen in fens).encode("ascii"))
+            self._stdin.flush()
+
+            # Read one response line per position
+            return [self._read_line(timeout) for _ in fens]
 
     def quit(self):
         """
         Tell the bot to quit and close the process.
         """
         if self.process.poll() is None:
-            self.process.stdin.write("quit\n")
-            self.process.stdin.flush()
-            self.process.stdin.close()
+            try:
+                self._stdin.write(self._QUIT)
+                self._stdin.flush()
+                self._stdin.close()
+            except BrokenPipeError:
+                # The engine already died; there is nothing left to tell it
+                pass
+            if self._sock is not None:
+                self._sock.close()
             self.process.wait()
 
 
 class BotWorker(QObject):
     finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+    # Stall guard only: the engine searches at a fixed depth with no time
+    # management, so deep middlegame positions can legitimately take a
+    # while. This bound exists to catch a hung engine, not a slow search.
+    _MOVE_TIMEOUT = 300.0
 
-    def __init__(self, fen, bot):
+    def __init__(self, bot):
         super().__init__()
-        self.fen = fen
         self.bot = bot
 
-    def run(self):
-        best_move = self.bot.send_fen(self.fen)
+    @pyqtSlot(str)
+    def on_request(self, fen):
+        """Compute the best move for a FEN received via a queued signal."""
+        try:
+            best_move = self.bot.send_fen(fen, timeout=self._MOVE_TIMEOUT)
+        except (TimeoutError, RuntimeError) as exc:
+            self.error.emit(str(exc))
+            return
         self.finished.emit(best_move)
 
 
-class ChessBoardWidget(QSvgWidget):
+class ChessBoardWidget(QGraphicsView):
     squareClicked = pyqtSignal(str)  # Signal to emit when a move is made
 
+    SQUARE_SIZE = 75
+    _LIGHT = "#ffce9e"
+    _DARK = "#d18b47"
+
+    # Square names indexed by rank_index * 8 + file_index of the flipped
+    # board, so coordinate lookups are a single table access
+    _SQUARE_NAMES = [chess.square_name(chess.square(7 - f, r))
+                     for r in range(8) for f in range(8)]
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setMouseTracking(True)
         self.start_square = None
         self.end_square = None
 
+        # Geometry-derived constants for coordinate lookups; refreshed in
+        # resizeEvent so mouse handlers never cross into Qt for the width
+        self._sq = self.SQUARE_SIZE
+        self._max = self.SQUARE_SIZE * 8
+
+        # Persistent scene: 64 square rects built once, piece items reused
+        # between moves so a move only touches the squares it changed
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameStyle(0)
+        size = self.SQUARE_SIZE * 8
+        self._scene = QGraphicsScene(0, 0, size, size, self)
+        self.setScene(self._scene)
+        self._draw_squares()
+
+        # One shared renderer per piece symbol; items reference, not copy
+        self._renderers = {
+            symbol: QSvgRenderer(QByteArray(
+                (f'<svg xmlns="http://www.w3.org/2000/svg" '
+                 f'viewBox="0 0 45 45">{glyph}</svg>').encode("utf-8")), self)
+            for symbol, glyph in chess.svg.PIECES.items()
+        }
+        self._piece_items = {}  # square index -> (symbol, QGraphicsSvgItem)
+
+    def _draw_squares(self):
+        size = self.SQUARE_SIZE
+        pen = QPen(Qt.NoPen)
+        light = QBrush(QColor(self._LIGHT))
+        dark = QBrush(QColor(self._DARK))
+        for rank_index in range(8):
+            for file_index in range(8):
+                # Screen column file_index shows file 7 - file_index
+                # because the board is drawn flipped for Black
+                brush = light if (7 - file_index + rank_index) % 2 else dark
+                self._scene.addRect(file_index * size, rank_index * size,
+                                    size, size, pen, brush)
+
+    def _square_pos(self, square):
+        size = self.SQUARE_SIZE
+        return ((7 - chess.square_file(square)) * size,
+                chess.square_rank(square) * size)
+
+    def update_position(self, board):
+        """Reposition only the piece items whose squares changed."""
+        piece_map = board.piece_map()
+
+        # Drop items whose square emptied or changed occupant
+        for square in list(self._piece_items):
+            symbol, item = self._piece_items[square]
+            piece = piece_map.get(square)
+            if piece is None or piece.symbol() != symbol:
+                self._scene.removeItem(item)
+                del self._piece_items[square]
+
+        # Add items for newly occupied or changed squares
+        for square, piece in piece_map.items():
+            if square in self._piece_items:
+                continue
+            symbol = piece.symbol()
+            item = QGraphicsSvgItem()
+            item.setSharedRenderer(self._renderers[symbol])
+            item.setScale(self.SQUARE_SIZE / 45.0)
+            item.setPos(*self._square_pos(square))
+            self._scene.addItem(item)
+            self._piece_items[square] = (symbol, item)
+
     def mousePressEvent(self, event):
         x = event.x()
         y = event.y()
@@ -86,38 +297,50 @@ class ChessBoardWidget(QSvgWidget):
         self.end_square = None
         super().mouseReleaseEvent(event)
 
+    def resizeEvent(self, event):
+        self._sq = self.width() // 8
+        self._max = self._sq * 8
+        super().resizeEvent(event)
+
     def get_square_from_coords(self, x, y):
-        square_size = self.width() / 8
-        file_index = int(x / square_size)
-        rank_index = int(y / square_size)
-
-        # Adjust for flipped board
-        file_number = 7 - file_index
-        rank_number = rank_index
-
-        if 0 <= file_number <= 7 and 0 <= rank_number <= 7:
-            square_index = chess.square(file_number, rank_number)
-            square = chess.square_name(square_index)
-            return square
+        # The board flip is already folded into the lookup table
+        if 0 <= x < self._max and 0 <= y < self._max:
+            return self._SQUARE_NAMES[(y // self._sq) * 8 + (x // self._sq)]
         return None
 
 
 class ChessGUI(QWidget):
+    requestBotMove = pyqtSignal(str)
+    botReady = pyqtSignal()
+
     def __init__(self, bot_path):
         super().__init__()
         self.setWindowTitle("Chess GUI - Play as Black")
         self.setGeometry(100, 100, 600, 700)
 
-        self.bot = ChessBot(bot_path)
+        # Spawn the engine in the background so subprocess startup overlaps
+        # with Qt window creation; the worker wiring completes in
+        # _on_bot_ready once the process is up
+        self.bot = None
+        self._bot_path = bot_path
+        self.botReady.connect(self._on_bot_ready)
+        threading.Thread(target=self._start_bot, daemon=True).start()
+
         self.board = chess.Board()
+        self._fen_cache = None
+        self._move_cache = collections.OrderedDict()
+        self._outcome = None
+
+        self.bot_thread = None
+        self.worker = None
 
         # Layout for widgets
         self.layout = QVBoxLayout(self)
 
-        # SVG Widget for chessboard
-        self.svg_widget = ChessBoardWidget(self)
-        self.svg_widget.setFixedSize(600, 600)
-        self.layout.addWidget(self.svg_widget)
+        # Chessboard widget
+        self.board_widget = ChessBoardWidget(self)
+        self.board_widget.setFixedSize(600, 600)
+        self.layout.addWidget(self.board_widget)
 
         # Input for UCI moves (optional)
         self.move_input = QLineEdit(self)
@@ -130,98 +353,146 @@ class ChessGUI(QWidget):
         self.submit_button.clicked.connect(self.handle_user_move)
         self.layout.addWidget(self.submit_button)
 
+        # Non-modal feedback for invalid moves
+        self.status_label = QLabel("", self)
+        self.layout.addWidget(self.status_label)
+
         # Connect the squareClicked signal to process_move
-        self.svg_widget.squareClicked.connect(self.process_move)
+        self.board_widget.squareClicked.connect(self.process_move)
 
-        # Render the initial board
+        # Render the initial board; input stays disabled until the engine
+        # is up and has made the first move
         self.update_board()
+        self.set_input_enabled(False)
+
+    def _start_bot(self):
+        """Spawn the engine subprocess off the GUI thread."""
+        self.bot = ChessBot(self._bot_path)
+        self.botReady.emit()
+
+    def _on_bot_ready(self):
+        """Wire the worker thread once the engine is up, then move first."""
+        # One long-lived worker thread serves all bot move requests
+        self.bot_thread = QThread()
+        self.worker = BotWorker(self.bot)
+        self.worker.moveToThread(self.bot_thread)
+        self.requestBotMove.connect(self.worker.on_request, Qt.QueuedConnection)
+        self.worker.finished.connect(self.on_bot_move_finished)
+        self.worker.error.connect(self.on_bot_error)
+        self.bot_thread.start()
 
         # AI makes the first move
         self.bot_move()
 
+    def _refresh_outcome(self):
+        """Re-run the termination checks once after a move was pushed."""
+        self._outcome = self.board.outcome(claim_draw=False)
+
+    def _current_fen(self):
+        """Return the board's FEN, memoized against the move stack length."""
+        n = len(self.board.move_stack)
+        if self._fen_cache is not None and self._fen_cache[0] == n:
+            return self._fen_cache[1]
+        fen = self.board.fen()
+        self._fen_cache = (n, fen)
+        return fen
+
     def update_board(self):
         """Update the chessboard display."""
-        svg_data = chess.svg.board(self.board, flipped=True).encode(
-            "utf-8")  # Flipped for Black
-        self.svg_widget.load(svg_data)
+        self.board_widget.update_position(self.board)
 
     def set_input_enabled(self, enabled):
         """Enable or disable the input box and button."""
         self.move_input.setEnabled(enabled)
         self.submit_button.setEnabled(enabled)
-        self.svg_widget.setEnabled(enabled)
+        self.board_widget.setEnabled(enabled)
 
     def handle_user_move(self):
         """Handle user input from the text box and update the board."""
         user_move = self.move_input.text().strip()
         self.process_move(user_move)
 
+    _MOVE_CACHE_SIZE = 4096
+
+    def _parse_uci(self, uci_move):
+        """Parse a UCI string into a Move, caching parses in a small LRU."""
+        move = self._move_cache.get(uci_move)
+        if move is not None:
+            self._move_cache.move_to_end(uci_move)
+            return move
+        move = chess.Move.from_uci(uci_move)
+        self._move_cache[uci_move] = move
+        if len(self._move_cache) > self._MOVE_CACHE_SIZE:
+            self._move_cache.popitem(last=False)
+        return move
+
+    def show_status(self, message):
+        """Show a transient status message below the input widgets."""
+        self.status_label.setText(message)
+        QTimer.singleShot(2000, self.status_label.clear)
+
     def process_move(self, uci_move):
         """Process a move made via drag-and-drop or text input."""
+        if not self.move_input.isEnabled():
+            # The bot is still thinking (or the game is over)
+            return
+
         if not uci_move:
-            QMessageBox.warning(self, "Invalid Input",
-                                "Please enter a valid move.")
+            self.show_status("Please enter a valid move.")
             return
 
         try:
             # Apply the user's move
-            move = chess.Move.from_uci(uci_move)
-            if move in self.board.legal_moves:
+            move = self._parse_uci(uci_move)
+            # is_legal tests the single move against the bitboards instead
+            # of materializing the full legal-move generator
+            if self.board.is_legal(move):
                 self.board.push(move)
+                self._refresh_outcome()
                 self.update_board()
                 self.move_input.clear()
 
-                # Disable input while the bot is thinking
-                self.set_input_enabled(False)
-
-                # Bot's turn
+                # Bot's turn; bot_move disables input while it thinks
                 self.bot_move()
             else:
-                QMessageBox.warning(self, "Invalid Move",
-                                    f"The move '{uci_move}' is not legal.")
+                self.show_status(f"The move '{uci_move}' is not legal.")
         except ValueError:
-            QMessageBox.warning(
-                self, "Invalid Input", "Please enter a move in UCI format (e.g., e7e5).")
+            self.show_status("Please enter a move in UCI format (e.g., e7e5).")
 
     def bot_move(self):
         """Get the bot's move and update the board."""
-        if not self.board.is_game_over():
+        if self._outcome is None:
             # Disable user input while AI is thinking
             self.set_input_enabled(False)
-            # Create a QThread
-            self.thread = QThread()
-            # Create a worker object
-            self.worker = BotWorker(self.board.fen(), self.bot)
-            # Move worker to the thread
-            self.worker.moveToThread(self.thread)
-            # Connect signals and slots
-            self.thread.started.connect(self.worker.run)
-            self.worker.finished.connect(self.on_bot_move_finished)
-            self.worker.finished.connect(self.thread.quit)
-            self.worker.finished.connect(self.worker.deleteLater)
-            self.thread.finished.connect(self.thread.deleteLater)
-            # Start the thread
-            self.thread.start()
+            # Hand the position to the persistent worker thread
+            self.requestBotMove.emit(self._current_fen())
         else:
             self.display_game_over()
 
     def on_bot_move_finished(self, best_move):
         """Handle the bot's move after it finishes computing."""
         self.board.push_uci(best_move)
+        self._refresh_outcome()
         self.update_board()
         self.set_input_enabled(True)
-        if self.board.is_game_over():
+        if self._outcome is not None:
             self.display_game_over()
 
+    def on_bot_error(self, message):
+        """Report a bot failure (timeout or crash) and re-enable input."""
+        QMessageBox.critical(self, "Bot Error", message)
+        self.set_input_enabled(True)
+
     def display_game_over(self):
         """Show a message when the game ends."""
-        if self.board.is_checkmate():
-            winner = "White" if self.board.turn == chess.BLACK else "Black"
+        outcome = self._outcome
+        if outcome.termination == chess.Termination.CHECKMATE:
+            winner = "White" if outcome.winner == chess.WHITE else "Black"
             QMessageBox.information(
                 self, "Game Over", f"Checkmate! {winner} wins.")
-        elif self.board.is_stalemate():
+        elif outcome.termination == chess.Termination.STALEMATE:
             QMessageBox.information(self, "Game Over", "Stalemate!")
-        elif self.board.is_insufficient_material():
+        elif outcome.termination == chess.Termination.INSUFFICIENT_MATERIAL:
             QMessageBox.information(
                 self, "Game Over", "Draw due to insufficient material.")
         else:
@@ -231,7 +502,11 @@ class ChessGUI(QWidget):
 
     def closeEvent(self, event):
         """Handle window close event to terminate the bot."""
-        self.bot.quit()
+        if self.bot_thread is not None:
+            self.bot_thread.quit()
+            self.bot_thread.wait()
+        if self.bot is not None:
+            self.bot.quit()
         event.accept()
 
 